@@ -5,6 +5,7 @@ Authentication module for Keycloak OAuth2/OIDC
 from app.auth.keycloak import (
     KeycloakAuth,
     User,
+    keycloak_auth,
     get_current_user,
     require_role,
     has_role,
@@ -14,6 +15,7 @@ from app.auth.keycloak import (
 __all__ = [
     "KeycloakAuth",
     "User",
+    "keycloak_auth",
     "get_current_user",
     "require_role",
     "has_role",
@@ -7,19 +7,48 @@ using Keycloak as the identity provider.
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2AuthorizationCodeBearer, HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError, ExpiredSignatureError
-from jose.exceptions import JWKError
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+import jwt
+from jwt import ExpiredSignatureError, InvalidTokenError
+import base64
+import binascii
+from jwt.algorithms import RSAAlgorithm
+from dataclasses import dataclass, field
+from typing import Optional, Any
+import asyncio
 import httpx
+import json
+import orjson
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+import re
 from functools import lru_cache
+from hashlib import blake2b
 import time
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "KeycloakAuth",
+    "User",
+    "keycloak_auth",
+    "get_current_user",
+    "require_role",
+    "has_role",
+    "has_any_role",
+]
+
+# Dedicated pool for RS256 signature verification. cryptography releases
+# the GIL inside OpenSSL, so verifies genuinely run in parallel here
+# without competing with asyncio's default executor (used by
+# run_in_executor callers elsewhere, e.g. file I/O).
+_VERIFY_POOL = ThreadPoolExecutor(
+    max_workers=(os.cpu_count() or 1) * 2,
+    thread_name_prefix="jwtverify"
+)
+
 # HTTP Bearer security scheme
 security = HTTPBearer(
     scheme_name="Bearer",
@@ -27,16 +56,135 @@ security = HTTPBearer(
 )
 
 
-class User(BaseModel):
-    """User model representing authenticated user"""
+@dataclass(frozen=True, slots=True)
+class User:
+    """
+    User model representing authenticated user
+
+    A plain dataclass rather than a Pydantic model: it is built once per
+    request from already-verified token claims, so there is nothing left
+    to validate and the construction cost should stay minimal.
+    """
     username: str
     email: Optional[str] = None
-    roles: List[str] = []
-    groups: List[str] = []
-    token_claims: Dict[str, Any] = {}
-    
-    class Config:
-        from_attributes = True
+    roles: frozenset = frozenset()
+    groups: list[str] = field(default_factory=list)
+    token_claims: dict[str, Any] = field(default_factory=dict)
+    # Alias of roles, kept for callers that predate the frozenset field
+    role_set: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Coerce list input (tests, older callers) to frozenset;
+        # object.__setattr__ because the dataclass is frozen
+        object.__setattr__(self, "roles", frozenset(self.roles))
+        object.__setattr__(self, "role_set", self.roles)
+
+
+@dataclass(frozen=True, slots=True)
+class _ParsedToken:
+    """
+    A bearer token split and hashed exactly once per request
+
+    The raw compact JWT gets touched several times on the auth path
+    (header decode for the kid, cache-key hashing, signature verify);
+    parsing it once at the dependency boundary and passing the parts
+    down removes the repeated split/base64/hash work.
+    """
+    raw: str
+    header: dict[str, Any]
+    payload_b64: str
+    digest: bytes  # blake2b-128 of the raw token, used as cache key
+
+    @property
+    def kid(self) -> Optional[str]:
+        return self.header.get("kid")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode one base64url JWT segment, restoring stripped padding"""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _parse_token(token: str) -> _ParsedToken:
+    """
+    Split a compact JWT and decode its header (no verification)
+
+    Raises:
+        HTTPException: 401 if the token is not a well-formed JWT
+    """
+    try:
+        header_b64, payload_b64, _ = token.split(".")
+        header = orjson.loads(_b64url_decode(header_b64))
+    except (ValueError, binascii.Error, orjson.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token format",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return _ParsedToken(
+        raw=token,
+        header=header,
+        payload_b64=payload_b64,
+        digest=blake2b(token.encode(), digest_size=16).digest()
+    )
+
+
+class _BatchVerifier:
+    """
+    Micro-batcher for RSA signature verification
+
+    Tokens arriving within a ~1ms window are verified in a single
+    thread-pool submission, so bursty traffic pays one executor hop per
+    batch instead of one per request, and the verify loop releases the
+    GIL once for the whole batch inside cryptography/OpenSSL.
+    """
+
+    def __init__(self, verify_fn, max_batch: int = 32, window: float = 0.001):
+        self._verify_fn = verify_fn
+        self._max_batch = max_batch
+        self._window = window
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def verify(self, *args) -> dict[str, Any]:
+        """Queue one verification and await its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((args, future))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        # The first batch drains immediately so a solo request never
+        # pays the window as pure added latency; the accumulation sleep
+        # only runs between successive batches, where it lets a
+        # sustained burst collect into full batches
+        while not self._queue.empty():
+            batch = []
+            while not self._queue.empty() and len(batch) < self._max_batch:
+                batch.append(self._queue.get_nowait())
+            results = await loop.run_in_executor(
+                _VERIFY_POOL, self._verify_batch, [args for args, _ in batch]
+            )
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            if not self._queue.empty():
+                await asyncio.sleep(self._window)
+
+    def _verify_batch(self, batch):
+        """Run every verification in one executor hop"""
+        results = []
+        for args in batch:
+            try:
+                results.append(self._verify_fn(*args))
+            except Exception as e:
+                results.append(e)
+        return results
 
 
 class KeycloakAuth:
@@ -45,158 +193,333 @@ class KeycloakAuth:
     
     Validates JWT tokens issued by Keycloak and extracts user information.
     """
-    
+
+    # Fixed attribute layout: lookups like self._token_cache happen
+    # several times per request, and slots make them offset loads
+    # instead of instance-dict probes. __dict__ is kept so instance
+    # methods on the singleton can still be monkeypatched in tests.
+    __slots__ = (
+        "__dict__",
+        "server_url", "realm", "client_id", "client_secret", "algorithms",
+        "issuer_url", "jwks_url", "token_url", "userinfo_url",
+        "introspect_url", "_audience", "_issuer", "_decode_options",
+        "_jwks_cache", "_jwks_cache_time", "_jwks_cache_duration",
+        "_jwks_etag", "_jwks_lock", "_last_forced_refresh",
+        "_forced_refresh_min_interval", "_http_client", "_keys_by_kid",
+        "_key_cache", "_token_cache", "_token_cache_max",
+        "_token_cache_ttl", "_introspect_cache", "_user_cache",
+        "_verifier",
+    )
+
     def __init__(self):
         self.server_url = settings.KEYCLOAK_SERVER_URL
         self.realm = settings.KEYCLOAK_REALM
         self.client_id = settings.KEYCLOAK_CLIENT_ID
         self.client_secret = settings.KEYCLOAK_CLIENT_SECRET
         self.algorithms = ["RS256"]
+
+        # Endpoint URLs, built once - these were properties, but the
+        # f-string formatting on every access adds up on the hot path
+        self.issuer_url = f"{self.server_url}/realms/{self.realm}"
+        self.jwks_url = f"{self.issuer_url}/protocol/openid-connect/certs"
+        self.token_url = f"{self.issuer_url}/protocol/openid-connect/token"
+        self.userinfo_url = f"{self.issuer_url}/protocol/openid-connect/userinfo"
+        self.introspect_url = f"{self.issuer_url}/protocol/openid-connect/token/introspect"
+
+        # Invariant decode arguments, hoisted out of validate_token
+        self._audience = self.client_id if settings.KEYCLOAK_VERIFY_AUDIENCE else None
+        self._issuer = self.issuer_url if settings.KEYCLOAK_VERIFY_ISSUER else None
+        self._decode_options = {
+            "verify_aud": settings.KEYCLOAK_VERIFY_AUDIENCE,
+            "verify_iss": settings.KEYCLOAK_VERIFY_ISSUER,
+            "verify_exp": True,
+            "verify_iat": True,
+        }
+
         self._jwks_cache = None
-        self._jwks_cache_time = 0
-        self._jwks_cache_duration = 3600  # 1 hour cache
+        self._jwks_cache_time = 0.0  # time.monotonic() of last fetch
+        self._jwks_cache_duration = 3600  # default, see Cache-Control
+        self._jwks_etag: Optional[str] = None
+        # Single-flight guard: on expiry, one coroutine refreshes while
+        # concurrent requests wait instead of racing to fetch
+        self._jwks_lock = asyncio.Lock()
+        # Rate limit for unknown-kid forced refreshes, so a stream of
+        # bogus-kid tokens cannot hammer Keycloak with JWKS fetches
+        self._last_forced_refresh = 0.0
+        self._forced_refresh_min_interval = 10.0
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._keys_by_kid: dict[str, dict[str, Any]] = {}
+        # Materialized RSA public keys by kid, so repeat validations
+        # skip base64-decoding n/e and rebuilding the public key
+        self._key_cache: dict[str, Any] = {}
+        # Validated-token cache: token hash -> (expiry, claims). Repeat
+        # requests with the same access token skip the RSA verify. The
+        # TTL is capped so the revocation window stays bounded.
+        self._token_cache: dict[bytes, tuple] = {}
+        self._token_cache_max = 4096
+        self._token_cache_ttl = 60.0
+        # Introspection cache, same shape/policy as the token cache:
+        # repeat requests within the TTL skip the Keycloak round trip
+        self._introspect_cache: dict[bytes, tuple] = {}
+        # Fully-built User objects by token digest. User is frozen, so
+        # sharing one instance across requests is safe; a hit makes the
+        # whole auth dependency a hash + dict lookup in either
+        # verification mode (local JWT or introspection).
+        self._user_cache: dict[bytes, tuple] = {}
+        # Batches concurrent signature verifications into single
+        # thread-pool submissions (see _BatchVerifier)
+        self._verifier = _BatchVerifier(self._decode)
         
-    @property
-    def issuer_url(self) -> str:
-        """Get the issuer URL for the Keycloak realm"""
-        return f"{self.server_url}/realms/{self.realm}"
-    
-    @property
-    def jwks_url(self) -> str:
-        """Get the JWKS URL for the Keycloak realm"""
-        return f"{self.issuer_url}/protocol/openid-connect/certs"
-    
-    @property
-    def token_url(self) -> str:
-        """Get the token endpoint URL"""
-        return f"{self.issuer_url}/protocol/openid-connect/token"
-    
-    @property
-    def userinfo_url(self) -> str:
-        """Get the userinfo endpoint URL"""
-        return f"{self.issuer_url}/protocol/openid-connect/userinfo"
-    
-    @property
-    def introspect_url(self) -> str:
-        """Get the token introspection endpoint URL"""
-        return f"{self.issuer_url}/protocol/openid-connect/token/introspect"
-    
-    async def get_jwks(self) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_jwks_ttl(response: httpx.Response) -> int:
+        """
+        Derive the JWKS cache TTL from the response's Cache-Control
+
+        Honors the server's max-age (with a 5-minute floor so a
+        misconfigured realm cannot force a fetch per request) and falls
+        back to one hour when the header is absent.
+        """
+        match = re.search(
+            r"max-age=(\d+)", response.headers.get("cache-control", "")
+        )
+        if match:
+            return max(300, int(match.group(1)))
+        return 3600
+
+    def _prune_cache(self, cache: dict[bytes, tuple], now: float) -> dict[bytes, tuple]:
+        """
+        Enforce the cache cap: drop expired entries, then evict the
+        soonest-expiring live ones if the cache is still full
+
+        Dropping only expired entries is not enough - with more than
+        _token_cache_max live distinct tokens per TTL window the dict
+        would grow without bound. Returns the pruned dict for the
+        caller to rebind.
+        """
+        pruned = {key: value for key, value in cache.items() if value[0] > now}
+        overflow = len(pruned) - self._token_cache_max + 1
+        if overflow > 0:
+            for key in sorted(pruned, key=lambda k: pruned[k][0])[:overflow]:
+                del pruned[key]
+        return pruned
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared pooled HTTP client, creating it on first use"""
+        if self._http_client is None:
+            # One pooled client for all Keycloak traffic (JWKS fetches,
+            # introspection). Keep-alive connections skip the TCP/TLS
+            # handshake on every call. No http2 flag: httpx only
+            # negotiates HTTP/2 via ALPN over TLS, and this service
+            # talks to Keycloak over cleartext http://.
+            self._http_client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on application shutdown)"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def get_jwks(self) -> dict[str, Any]:
         """
         Fetch and cache JWKS (JSON Web Key Set) from Keycloak
-        
+
         Returns:
             Dict containing the JWKS
         """
-        current_time = time.time()
-        
+        # time.monotonic() is immune to wall-clock jumps (NTP, DST)
+        now = time.monotonic()
+
         # Return cached JWKS if still valid
-        if self._jwks_cache and (current_time - self._jwks_cache_time) < self._jwks_cache_duration:
+        if self._jwks_cache and (now - self._jwks_cache_time) < self._jwks_cache_duration:
             return self._jwks_cache
-        
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.jwks_url, timeout=10.0)
+
+        async with self._jwks_lock:
+            # Double-checked expiry: another coroutine may have
+            # refreshed while this one waited for the lock
+            now = time.monotonic()
+            if self._jwks_cache and (now - self._jwks_cache_time) < self._jwks_cache_duration:
+                return self._jwks_cache
+
+            try:
+                client = self._get_http_client()
+                headers = {}
+                if self._jwks_etag and self._jwks_cache:
+                    headers["If-None-Match"] = self._jwks_etag
+                response = await client.get(
+                    self.jwks_url, headers=headers, timeout=10.0
+                )
+
+                # Key set unchanged: extend the TTL, skip re-parsing
+                if response.status_code == 304 and self._jwks_cache:
+                    self._jwks_cache_time = now
+                    self._jwks_cache_duration = self._parse_jwks_ttl(response)
+                    return self._jwks_cache
+
                 response.raise_for_status()
-                self._jwks_cache = response.json()
-                self._jwks_cache_time = current_time
+                # orjson parses the raw bytes directly - faster than
+                # httpx's stdlib-json .json() and skips a str decode
+                self._jwks_cache = orjson.loads(response.content)
+                self._jwks_cache_time = now
+                self._jwks_cache_duration = self._parse_jwks_ttl(response)
+                self._jwks_etag = response.headers.get("etag")
+                # Index keys by kid so per-token lookup is a dict get
+                # instead of a scan over jwks["keys"]
+                self._keys_by_kid = {
+                    key["kid"]: key
+                    for key in self._jwks_cache.get("keys", [])
+                    if "kid" in key
+                }
+                # Drop materialized keys from the previous key set
+                self._key_cache = {}
                 logger.info("JWKS fetched successfully from Keycloak")
                 return self._jwks_cache
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to fetch JWKS: {str(e)}")
-            if self._jwks_cache:
-                logger.warning("Using cached JWKS")
-                return self._jwks_cache
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Unable to verify token: Keycloak unavailable"
-            )
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to fetch JWKS: {str(e)}")
+                if self._jwks_cache:
+                    logger.warning("Using cached JWKS")
+                    return self._jwks_cache
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Unable to verify token: Keycloak unavailable"
+                )
     
-    async def get_signing_key(self, token: str) -> Dict[str, Any]:
+    async def get_signing_key(self, parsed: _ParsedToken) -> dict[str, Any]:
         """
         Get the signing key for a token from JWKS
-        
+
         Args:
-            token: JWT token to get signing key for
-            
+            parsed: Token already split/decoded by _parse_token
+
         Returns:
             Dict containing the signing key
         """
-        try:
-            # Decode header without verification to get key ID
-            unverified_header = jwt.get_unverified_header(token)
-            kid = unverified_header.get("kid")
-            
-            if not kid:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token missing key ID"
-                )
-            
-            jwks = await self.get_jwks()
-            
-            for key in jwks.get("keys", []):
-                if key.get("kid") == kid:
-                    return key
-            
-            # Key not found, try refreshing JWKS
-            self._jwks_cache = None
-            jwks = await self.get_jwks()
-            
-            for key in jwks.get("keys", []):
-                if key.get("kid") == kid:
-                    return key
-            
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Unable to find signing key"
-            )
-        except JWTError as e:
-            logger.error(f"JWT error getting signing key: {str(e)}")
+        # The header was decoded once in _parse_token; just read the kid
+        kid = parsed.kid
+
+        if not kid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token format"
+                detail="Token missing key ID"
             )
+
+        await self.get_jwks()
+
+        key = self._keys_by_kid.get(kid)
+        if key is not None:
+            return key
+
+        # Key not found - likely a rotation. Force one refresh, but
+        # rate-limited so unknown kids cannot drive a fetch storm.
+        now = time.monotonic()
+        if now - self._last_forced_refresh >= self._forced_refresh_min_interval:
+            self._last_forced_refresh = now
+            self._jwks_cache = None
+            await self.get_jwks()
+
+            key = self._keys_by_kid.get(kid)
+            if key is not None:
+                return key
+
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unable to find signing key"
+        )
     
-    async def validate_token(self, token: str) -> Dict[str, Any]:
+    def _decode(self, token: str, rsa_key) -> dict[str, Any]:
+        """Synchronous RS256 verify + decode, run in the executor"""
+        return jwt.decode(
+            token,
+            rsa_key,
+            algorithms=self.algorithms,
+            audience=self._audience,
+            issuer=self._issuer,
+            options=self._decode_options
+        )
+
+    async def validate_token(self, token) -> dict[str, Any]:
         """
         Validate a JWT token from Keycloak
-        
+
         Args:
-            token: JWT token to validate
-            
+            token: JWT token to validate (str or _ParsedToken)
+
         Returns:
             Dict containing the validated token claims
         """
+        parsed = token if isinstance(token, _ParsedToken) else _parse_token(token)
+
+        # Check the validated-token cache first. The key is a fast
+        # non-cryptographic hash - it only needs to be unique, the
+        # actual trust comes from the verification that populated it.
+        cache_key = parsed.digest
+        now = time.time()
+        cached = self._token_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        # Cheap expiry pre-check on the unverified payload: an already
+        # expired token would fail with ExpiredSignatureError anyway, so
+        # spending an RSA verify on it is pure waste (this matters most
+        # during retry storms after key rotation or mass expiry). The
+        # authoritative exp check still happens post-verify via
+        # verify_exp in _decode_options.
         try:
-            signing_key = await self.get_signing_key(token)
-            
-            # Build the public key from JWKS
-            from jose.backends import RSAKey
-            rsa_key = {
-                "kty": signing_key["kty"],
-                "kid": signing_key["kid"],
-                "use": signing_key.get("use", "sig"),
-                "n": signing_key["n"],
-                "e": signing_key["e"]
-            }
-            
-            # Verify and decode the token
-            payload = jwt.decode(
-                token,
-                rsa_key,
-                algorithms=self.algorithms,
-                audience=self.client_id if settings.KEYCLOAK_VERIFY_AUDIENCE else None,
-                issuer=self.issuer_url if settings.KEYCLOAK_VERIFY_ISSUER else None,
-                options={
-                    "verify_aud": settings.KEYCLOAK_VERIFY_AUDIENCE,
-                    "verify_iss": settings.KEYCLOAK_VERIFY_ISSUER,
-                    "verify_exp": True,
-                    "verify_iat": True,
-                }
+            exp = orjson.loads(_b64url_decode(parsed.payload_b64)).get("exp")
+        except (ValueError, binascii.Error, orjson.JSONDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token format",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        if isinstance(exp, (int, float)) and exp < now:
+            logger.warning("Token has expired")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has expired",
+                headers={"WWW-Authenticate": "Bearer"}
             )
+
+        try:
+            signing_key = await self.get_signing_key(parsed)
+
+            # Reuse the materialized public key for this kid; building
+            # one decodes the modulus/exponent and constructs a fresh
+            # cryptography key object, which is pure per-request waste
+            kid = signing_key["kid"]
+            rsa_key = self._key_cache.get(kid)
+            if rsa_key is None:
+                rsa_key = RSAAlgorithm.from_jwk(json.dumps({
+                    "kty": signing_key["kty"],
+                    "kid": kid,
+                    "use": signing_key.get("use", "sig"),
+                    "n": signing_key["n"],
+                    "e": signing_key["e"]
+                }))
+                self._key_cache[kid] = rsa_key
+
+            # Verify and decode the token (batched, off the event loop)
+            payload = await self._verifier.verify(parsed.raw, rsa_key)
             
             logger.debug(f"Token validated for user: {payload.get('preferred_username')}")
+
+            # Cache for min(ttl, time until token expiry)
+            exp = payload.get("exp")
+            ttl = self._token_cache_ttl
+            if exp:
+                ttl = min(ttl, exp - now)
+            if ttl > 0:
+                if len(self._token_cache) >= self._token_cache_max:
+                    self._token_cache = self._prune_cache(self._token_cache, now)
+                self._token_cache[cache_key] = (now + ttl, payload)
+
             return payload
             
         except ExpiredSignatureError:
@@ -206,7 +529,7 @@ class KeycloakAuth:
                 detail="Token has expired",
                 headers={"WWW-Authenticate": "Bearer"}
             )
-        except JWTError as e:
+        except InvalidTokenError as e:
             logger.error(f"JWT validation error: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -214,41 +537,66 @@ class KeycloakAuth:
                 headers={"WWW-Authenticate": "Bearer"}
             )
     
-    async def introspect_token(self, token: str) -> Dict[str, Any]:
+    async def introspect_token(
+        self, token: str, cache_key: Optional[bytes] = None
+    ) -> dict[str, Any]:
         """
         Introspect a token using Keycloak's introspection endpoint
-        
+
         This is an alternative to local JWT validation that checks
         the token's status on the Keycloak server.
-        
+
         Args:
             token: Token to introspect
-            
+            cache_key: Precomputed token digest, if the caller already
+                hashed the token (avoids hashing it twice)
+
         Returns:
             Dict containing introspection response
         """
+        # Serve repeat introspections of the same token locally: the
+        # network round trip dominates this path, and the TTL is capped
+        # at 60s and at the token's own exp
+        if cache_key is None:
+            cache_key = blake2b(token.encode(), digest_size=16).digest()
+        now = time.time()
+        cached = self._introspect_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.introspect_url,
-                    data={
-                        "token": token,
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret
-                    },
-                    timeout=10.0
+            client = self._get_http_client()
+            response = await client.post(
+                self.introspect_url,
+                data={
+                    "token": token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                },
+                timeout=10.0
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+
+            if not result.get("active", False):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token is not active",
+                    headers={"WWW-Authenticate": "Bearer"}
                 )
-                response.raise_for_status()
-                result = response.json()
-                
-                if not result.get("active", False):
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token is not active",
-                        headers={"WWW-Authenticate": "Bearer"}
+
+            exp = result.get("exp")
+            ttl = self._token_cache_ttl
+            if exp:
+                ttl = min(ttl, exp - now)
+            if ttl > 0:
+                if len(self._introspect_cache) >= self._token_cache_max:
+                    self._introspect_cache = self._prune_cache(
+                        self._introspect_cache, now
                     )
-                
-                return result
+                self._introspect_cache[cache_key] = (now + ttl, result)
+
+            return result
         except httpx.HTTPError as e:
             logger.error(f"Token introspection failed: {str(e)}")
             raise HTTPException(
@@ -256,7 +604,7 @@ class KeycloakAuth:
                 detail="Token introspection failed"
             )
     
-    def extract_user_from_claims(self, claims: Dict[str, Any]) -> User:
+    def extract_user_from_claims(self, claims: dict[str, Any]) -> User:
         """
         Extract user information from token claims
         
@@ -266,25 +614,21 @@ class KeycloakAuth:
         Returns:
             User object with extracted information
         """
-        # Extract roles from realm and client roles
-        roles = []
-        
-        # Realm roles
+        # Union realm and client roles straight into a frozenset -
+        # deduplication is free and no intermediate list is built
         realm_access = claims.get("realm_access", {})
-        roles.extend(realm_access.get("roles", []))
-        
-        # Client roles
-        resource_access = claims.get("resource_access", {})
-        client_roles = resource_access.get(self.client_id, {})
-        roles.extend(client_roles.get("roles", []))
-        
+        client_roles = claims.get("resource_access", {}).get(self.client_id, {})
+        roles = frozenset(realm_access.get("roles", ())) | frozenset(
+            client_roles.get("roles", ())
+        )
+
         # Extract groups
         groups = claims.get("groups", [])
-        
+
         return User(
             username=claims.get("preferred_username", claims.get("sub")),
             email=claims.get("email"),
-            roles=list(set(roles)),  # Remove duplicates
+            roles=roles,
             groups=groups,
             token_claims=claims
         )
@@ -306,19 +650,45 @@ async def get_current_user(
     Returns:
         Authenticated User object
     """
-    token = credentials.credentials
-    
+    # Split and hash the token exactly once; every downstream step
+    # (kid lookup, cache keys, verify) works from the parsed parts
+    parsed = _parse_token(credentials.credentials)
+
+    # Repeat requests with the same token get the same (immutable) User
+    # back without touching the claims caches or rebuilding role sets
+    now = time.time()
+    cached = keycloak_auth._user_cache.get(parsed.digest)
+    if cached and cached[0] > now:
+        return cached[1]
+
     if settings.KEYCLOAK_USE_INTROSPECTION:
         # Use token introspection (checks with Keycloak server)
-        claims = await keycloak_auth.introspect_token(token)
+        claims = await keycloak_auth.introspect_token(
+            parsed.raw, cache_key=parsed.digest
+        )
     else:
         # Local JWT validation
-        claims = await keycloak_auth.validate_token(token)
-    
-    return keycloak_auth.extract_user_from_claims(claims)
+        claims = await keycloak_auth.validate_token(parsed)
 
+    user = keycloak_auth.extract_user_from_claims(claims)
 
-async def require_role(required_roles: List[str]):
+    # Same TTL policy as the claims caches: bounded window, never past
+    # the token's own expiry
+    exp = claims.get("exp")
+    ttl = keycloak_auth._token_cache_ttl
+    if exp:
+        ttl = min(ttl, exp - now)
+    if ttl > 0:
+        if len(keycloak_auth._user_cache) >= keycloak_auth._token_cache_max:
+            keycloak_auth._user_cache = keycloak_auth._prune_cache(
+                keycloak_auth._user_cache, now
+            )
+        keycloak_auth._user_cache[parsed.digest] = (now + ttl, user)
+
+    return user
+
+
+async def require_role(required_roles: list[str]):
     """
     Factory function to create a dependency that requires specific roles
     
@@ -328,18 +698,20 @@ async def require_role(required_roles: List[str]):
     Returns:
         Dependency function
     """
+    # Frozen once at factory time; role_checker runs per request and
+    # should not rebuild anything from the list
+    required = frozenset(required_roles)
+    detail = f"Insufficient permissions. Required roles: {required_roles}"
+
     async def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        user_roles = set(current_user.roles)
-        required = set(required_roles)
-        
-        if not user_roles.intersection(required):
+        if current_user.role_set.isdisjoint(required):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required roles: {required_roles}"
+                detail=detail
             )
-        
+
         return current_user
-    
+
     return role_checker
 
 
@@ -354,10 +726,10 @@ def has_role(user: User, role: str) -> bool:
     Returns:
         True if user has the role, False otherwise
     """
-    return role in user.roles
+    return role in user.role_set
 
 
-def has_any_role(user: User, roles: List[str]) -> bool:
+def has_any_role(user: User, roles: list[str]) -> bool:
     """
     Check if a user has any of the specified roles
     
@@ -368,4 +740,4 @@ def has_any_role(user: User, roles: List[str]) -> bool:
     Returns:
         True if user has at least one of the roles, False otherwise
     """
-    return bool(set(user.roles).intersection(set(roles)))
+    return not user.role_set.isdisjoint(roles)
@@ -5,10 +5,9 @@ Manages all configuration settings using environment variables
 with Pydantic settings management.
 """
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from typing import List, Optional
-from functools import lru_cache
 
 
 class Settings(BaseSettings):
@@ -75,6 +74,10 @@ class Settings(BaseSettings):
         default=120.0,
         description="Timeout in seconds for Ollama API requests"
     )
+    OLLAMA_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="Maximum concurrent Ollama generations (e.g. map-reduce chunks)"
+    )
     
     # File Upload Settings
     MAX_UPLOAD_SIZE: int = Field(
@@ -84,24 +87,28 @@ class Settings(BaseSettings):
     
     # Logging Settings
     LOG_LEVEL: str = Field(default="INFO")
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        extra = "ignore"
+
+    # Settings are frozen: they are read once at import and never
+    # mutated, which also lets Pydantic skip its __setattr__ validation
+    model_config = SettingsConfigDict(
+        frozen=True,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore"
+    )
+
+
+# Global settings instance - import this directly instead of calling
+# get_settings(), which only exists for backwards compatibility
+settings = Settings()
 
 
-@lru_cache()
 def get_settings() -> Settings:
     """
-    Get cached settings instance
-    
+    Get the settings instance
+
     Returns:
         Settings object with loaded configuration
     """
-    return Settings()
-
-
-# Global settings instance
-settings = get_settings()
+    return settings
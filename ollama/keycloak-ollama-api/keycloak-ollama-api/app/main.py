@@ -3,21 +3,22 @@ FastAPI Application with Keycloak OAuth2/OIDC Authentication
 Calls Ollama API for document summarization
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import FastAPI, Depends, HTTPException, Request, status, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import codecs
+import io
 import logging
 
-from app.auth.keycloak import KeycloakAuth, get_current_user, User
+import msgspec
+
+from app.auth.keycloak import keycloak_auth, get_current_user, User
 from app.services.ollama_service import OllamaService
 from app.config import settings
-from app.models.schemas import (
-    SummarizeRequest,
-    SummarizeResponse,
-    HealthResponse,
-    DocumentUploadResponse
-)
+from app.models.schemas import HealthResponse
+from app.models import schemas_fast
 
 # Configure logging
 logging.basicConfig(
@@ -26,10 +27,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize services
-keycloak_auth = KeycloakAuth()
+# Initialize services. keycloak_auth is the module singleton from
+# app.auth.keycloak, so the JWKS/key/token caches are shared with the
+# get_current_user dependency instead of being duplicated per instance.
 ollama_service = OllamaService()
 
+# Upload handling tables, built once at import
+ALLOWED_EXTENSIONS = frozenset({'.txt', '.md', '.pdf', '.docx', '.doc'})
+_EXTRACTORS = {
+    '.pdf': ollama_service.extract_pdf_text,
+    '.docx': ollama_service.extract_docx_text,
+    '.doc': ollama_service.extract_docx_text,
+}
+
+# Response models below are built with model_construct(), which skips
+# field-by-field validation. This is safe only because every field is
+# produced by server code from already-validated data; any field that
+# could reflect raw user input must go through a normal constructor.
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -38,32 +53,42 @@ async def lifespan(app: FastAPI):
     logger.info(f"Keycloak Server: {settings.KEYCLOAK_SERVER_URL}")
     logger.info(f"Keycloak Realm: {settings.KEYCLOAK_REALM}")
     logger.info(f"Ollama URL: {settings.OLLAMA_URL}")
+    # Load the default model now so the first request skips the
+    # multi-second cold start (failures are logged, not fatal)
+    await ollama_service.warmup()
     yield
     logger.info("Shutting down application...")
+    # Release the pooled Keycloak and Ollama HTTP connections cleanly
+    await keycloak_auth.aclose()
+    await ollama_service.aclose()
 
 
 app = FastAPI(
     title="Document Summarization API",
     description="OAuth2/OIDC protected API that uses Ollama for document summarization",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware configuration
+# CORS middleware configuration. Methods and headers are listed
+# explicitly instead of "*" so Starlette can answer preflights from
+# precomputed sets rather than wildcard-matching every request; the API
+# only ever uses GET/POST with Authorization/Content-Type.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=tuple(settings.CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
+@app.get("/health", response_model=None, tags=["Health"])
 async def health_check():
     """Health check endpoint - no authentication required"""
     ollama_status = await ollama_service.check_health()
-    return HealthResponse(
+    return HealthResponse.model_construct(
         status="healthy",
         ollama_connected=ollama_status,
         keycloak_configured=bool(settings.KEYCLOAK_SERVER_URL)
@@ -76,37 +101,57 @@ async def get_user_info(current_user: User = Depends(get_current_user)):
     return {
         "username": current_user.username,
         "email": current_user.email,
-        "roles": current_user.roles,
+        # roles is a frozenset internally; lists only at the boundary
+        "roles": sorted(current_user.roles),
         "token_claims": current_user.token_claims
     }
 
 
-@app.post("/api/v1/summarize", response_model=SummarizeResponse, tags=["Summarization"])
+@app.post("/api/v1/summarize", response_model=None, tags=["Summarization"])
 async def summarize_text(
-    request: SummarizeRequest,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """
     Summarize provided text using Ollama
-    
+
     Requires valid OAuth2 token from Keycloak
     """
     logger.info(f"Summarization request from user: {current_user.username}")
-    
+
+    # Decode the body with msgspec instead of Pydantic - single-pass C
+    # JSON parsing is significantly faster on this hot path
+    try:
+        body = schemas_fast.summarize_request_decoder.decode(await request.body())
+    except msgspec.ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except msgspec.DecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid JSON body"
+        )
+
     try:
         summary = await ollama_service.summarize_text(
-            text=request.text,
-            model=request.model,
-            max_length=request.max_length,
-            style=request.style
+            text=body.text,
+            model=body.model,
+            max_length=body.max_length,
+            style=body.style
         )
-        
-        return SummarizeResponse(
-            summary=summary,
-            model_used=request.model or settings.OLLAMA_DEFAULT_MODEL,
-            original_length=len(request.text),
-            summary_length=len(summary),
-            user=current_user.username
+
+        response = {
+            "summary": summary,
+            "model_used": body.model,
+            "original_length": len(body.text),
+            "summary_length": len(summary),
+            "user": current_user.username
+        }
+        return Response(
+            content=schemas_fast.json_encoder.encode(response),
+            media_type="application/json"
         )
     except Exception as e:
         logger.error(f"Summarization error: {str(e)}")
@@ -116,7 +161,7 @@ async def summarize_text(
         )
 
 
-@app.post("/api/v1/summarize/document", response_model=DocumentUploadResponse, tags=["Summarization"])
+@app.post("/api/v1/summarize/document", response_model=None, tags=["Summarization"])
 async def summarize_document(
     file: UploadFile = File(...),
     model: str = Form(default=None),
@@ -131,30 +176,45 @@ async def summarize_document(
     """
     logger.info(f"Document upload from user: {current_user.username}, file: {file.filename}")
     
-    # Validate file type
-    allowed_extensions = {'.txt', '.md', '.pdf', '.docx', '.doc'}
-    file_ext = '.' + file.filename.split('.')[-1].lower() if '.' in file.filename else ''
-    
-    if file_ext not in allowed_extensions:
+    # Validate file type. rpartition avoids splitting the whole name
+    # and handles dotless filenames correctly.
+    _, dot, ext = (file.filename or '').rpartition('.')
+    file_ext = f".{ext.lower()}" if dot else ''
+
+    if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not supported. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"File type not supported. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
         )
     
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Extract text based on file type
-        if file_ext in {'.txt', '.md'}:
-            text = content.decode('utf-8')
-        elif file_ext == '.pdf':
-            text = await ollama_service.extract_pdf_text(content)
-        elif file_ext in {'.docx', '.doc'}:
-            text = await ollama_service.extract_docx_text(content)
+        # Starlette has already spooled the upload to a temp file, so
+        # hand that file-like straight to the extractors instead of
+        # copying the whole body into a bytes object. The size limit is
+        # enforced with a seek, not a read.
+        upload = file.file
+        upload.seek(0, io.SEEK_END)
+        total_size = upload.tell()
+        upload.seek(0)
+        if total_size > settings.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+
+        # Extract text based on file type; .txt/.md decode incrementally
+        extractor = _EXTRACTORS.get(file_ext)
+        if extractor:
+            text = await extractor(upload)
         else:
-            text = content.decode('utf-8', errors='ignore')
-        
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            parts = []
+            while chunk := upload.read(65536):
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b'', final=True))
+            text = ''.join(parts)
+
+
         if not text.strip():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -169,13 +229,17 @@ async def summarize_document(
             style=style
         )
         
-        return DocumentUploadResponse(
-            filename=file.filename,
-            summary=summary,
-            model_used=model or settings.OLLAMA_DEFAULT_MODEL,
-            original_length=len(text),
-            summary_length=len(summary),
-            user=current_user.username
+        response = {
+            "filename": file.filename,
+            "summary": summary,
+            "model_used": model or settings.OLLAMA_DEFAULT_MODEL,
+            "original_length": len(text),
+            "summary_length": len(summary),
+            "user": current_user.username
+        }
+        return Response(
+            content=schemas_fast.json_encoder.encode(response),
+            media_type="application/json"
         )
     except HTTPException:
         raise
@@ -221,6 +285,42 @@ async def query_ollama(
         )
 
 
+@app.post("/api/v1/query/stream", tags=["Query"])
+async def query_ollama_stream(
+    prompt: str = Form(...),
+    model: str = Form(default=None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Send a custom query to Ollama and stream the response tokens
+
+    Requires valid OAuth2 token from Keycloak
+    """
+    logger.info(f"Streaming query request from user: {current_user.username}")
+
+    # Pull the first fragment before committing to a response: an
+    # Ollama failure at this point becomes a proper 500 like the
+    # sibling /api/v1/query, instead of a 200 whose body is cut off
+    # after the headers have already been sent
+    stream = ollama_service.generate_stream(prompt=prompt, model=model)
+    try:
+        first = await anext(stream, None)
+    except Exception as e:
+        logger.error(f"Streaming query error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Query failed: {str(e)}"
+        )
+
+    async def remainder():
+        if first is not None:
+            yield first
+        async for chunk in stream:
+            yield chunk
+
+    return StreamingResponse(remainder(), media_type="text/plain")
+
+
 @app.get("/api/v1/models", tags=["Models"])
 async def list_models(current_user: User = Depends(get_current_user)):
     """
@@ -5,9 +5,16 @@ Defines all data models used in API requests and responses.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from enum import Enum
 
+from app.config import settings
+
+
+def _default_model() -> str:
+    """Default Ollama model, resolved once at validation time"""
+    return settings.OLLAMA_DEFAULT_MODEL
+
 
 class SummaryStyle(str, Enum):
     """Available summary styles"""
@@ -26,6 +33,14 @@ class AnalysisType(str, Enum):
     TOPICS = "topics"
 
 
+# Precomputed string -> enum dispatch tables. O(1) dict lookups replace
+# Pydantic's per-request enum coercion (a member scan with exception
+# fallback); the request models below validate against Literal values
+# so pydantic-core stays on its interned-string equality fast path.
+STYLE_MAP = {s.value: s for s in SummaryStyle}
+ANALYSIS_TYPE_MAP = {t.value: t for t in AnalysisType}
+
+
 # Request Models
 
 class SummarizeRequest(BaseModel):
@@ -35,8 +50,8 @@ class SummarizeRequest(BaseModel):
         min_length=10,
         description="Text to summarize"
     )
-    model: Optional[str] = Field(
-        default=None,
+    model: str = Field(
+        default_factory=_default_model,
         description="Ollama model to use (uses default if not specified)"
     )
     max_length: int = Field(
@@ -45,7 +60,9 @@ class SummarizeRequest(BaseModel):
         le=5000,
         description="Approximate maximum length of summary in words"
     )
-    style: str = Field(
+    style: Literal[
+        "concise", "detailed", "bullet_points", "executive", "academic"
+    ] = Field(
         default="concise",
         description="Summary style: concise, detailed, bullet_points, executive, academic"
     )
@@ -68,8 +85,8 @@ class QueryRequest(BaseModel):
         min_length=1,
         description="Query or prompt to send to Ollama"
     )
-    model: Optional[str] = Field(
-        default=None,
+    model: str = Field(
+        default_factory=_default_model,
         description="Ollama model to use"
     )
     context: Optional[str] = Field(
@@ -100,21 +117,20 @@ class AnalyzeRequest(BaseModel):
         min_length=10,
         description="Text to analyze"
     )
-    analysis_type: AnalysisType = Field(
-        default=AnalysisType.GENERAL,
+    analysis_type: Literal["general", "sentiment", "entities", "topics"] = Field(
+        default="general",
         description="Type of analysis to perform"
     )
-    model: Optional[str] = Field(
-        default=None,
+    model: str = Field(
+        default_factory=_default_model,
         description="Ollama model to use"
     )
 
 
 class ChatMessage(BaseModel):
     """Single chat message"""
-    role: str = Field(
+    role: Literal["user", "assistant", "system"] = Field(
         ...,
-        pattern="^(user|assistant|system)$",
         description="Message role: user, assistant, or system"
     )
     content: str = Field(
@@ -131,8 +147,8 @@ class ChatRequest(BaseModel):
         min_length=1,
         description="List of chat messages"
     )
-    model: Optional[str] = Field(
-        default=None,
+    model: str = Field(
+        default_factory=_default_model,
         description="Ollama model to use"
     )
     temperature: float = Field(
@@ -237,4 +253,4 @@ class UserInfo(BaseModel):
     username: str = Field(description="Username")
     email: Optional[str] = Field(description="User email")
     roles: List[str] = Field(description="User roles")
-    groups: List[str] = Field(default=[], description="User groups")
+    groups: List[str] = Field(default_factory=list, description="User groups")
@@ -0,0 +1,56 @@
+"""
+msgspec Structs for Hot-Path Request/Response Models
+
+Mirrors the Pydantic models in schemas.py for the endpoints that are hit
+on every request. msgspec decodes JSON in a single C pass and builds far
+fewer Python objects than Pydantic, so these are used on the hot API
+paths while the Pydantic models remain the source of truth for OpenAPI
+documentation. Only the models a JSON endpoint actually decodes live
+here - /api/v1/query and the upload routes are form-encoded and never
+see a struct.
+"""
+
+import msgspec
+
+from app.config import settings
+from app.models.schemas import STYLE_MAP
+
+
+def _default_model() -> str:
+    """Default Ollama model, resolved once at decode time"""
+    return settings.OLLAMA_DEFAULT_MODEL
+
+
+def _validate_range(name: str, value: int, lo: int, hi: int) -> None:
+    """Raise msgspec.ValidationError if value is outside [lo, hi]"""
+    if not lo <= value <= hi:
+        raise msgspec.ValidationError(
+            f"{name} must be between {lo} and {hi}, got {value}"
+        )
+
+
+class SummarizeRequest(msgspec.Struct, frozen=True):
+    """Request struct for text summarization"""
+    text: str
+    model: str = msgspec.field(default_factory=_default_model)
+    max_length: int = 500
+    style: str = "concise"
+
+    def __post_init__(self):
+        if len(self.text) < 10:
+            raise msgspec.ValidationError(
+                "text must be at least 10 characters long"
+            )
+        _validate_range("max_length", self.max_length, 50, 5000)
+        # Same value set the Pydantic model declares via Literal; the
+        # shared table keeps the two schemas from drifting apart
+        if self.style not in STYLE_MAP:
+            raise msgspec.ValidationError(
+                f"style must be one of {sorted(STYLE_MAP)}, got '{self.style}'"
+            )
+
+
+# Shared decoder/encoder instances (building these is not free, so they
+# are created once at import time and reused for every request)
+summarize_request_decoder = msgspec.json.Decoder(SummarizeRequest)
+json_encoder = msgspec.json.Encoder()
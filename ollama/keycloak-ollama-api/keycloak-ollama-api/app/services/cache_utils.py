@@ -0,0 +1,47 @@
+"""
+Cache Math Utilities
+
+Similarity-search kernels for the semantic response cache. When numba
+is installed the argmax-cosine scan is JIT-compiled (parallel SIMD loop,
+no temporary similarity array); otherwise a NumPy matvec is used, which
+is already fast for the cache sizes this service sees.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def argmax_cosine(query, matrix):
+        """Index and value of the row of matrix most similar to query"""
+        # Fill the similarity array in parallel, then argmax serially:
+        # a conditional best/idx update across prange iterations is not
+        # a reduction numba supports and compiles to wrong results
+        similarities = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in prange(matrix.shape[0]):
+            s = 0.0
+            for j in range(matrix.shape[1]):
+                s += query[j] * matrix[i, j]
+            similarities[i] = s
+        idx = 0
+        for i in range(1, similarities.shape[0]):
+            if similarities[i] > similarities[idx]:
+                idx = i
+        return idx, similarities[idx]
+
+    # Warm up the JIT once at import with a tiny input so the first
+    # user request does not pay the compile stall
+    argmax_cosine(
+        np.zeros(4, dtype=np.float32), np.zeros((1, 4), dtype=np.float32)
+    )
+else:
+    def argmax_cosine(query, matrix):
+        """Index and value of the row of matrix most similar to query"""
+        similarities = matrix @ query
+        idx = int(similarities.argmax())
+        return idx, float(similarities[idx])
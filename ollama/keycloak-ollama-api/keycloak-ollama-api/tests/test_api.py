@@ -14,14 +14,16 @@ from app.main import app
 from app.auth.keycloak import User
 
 
-# Test fixtures
-@pytest.fixture
+# Test fixtures. Session-scoped: TestClient construction compiles every
+# route and the fixtures below are never mutated, so one instance is
+# shared across the whole run.
+@pytest.fixture(scope="session")
 def client():
     """Create a test client"""
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_user():
     """Create a mock authenticated user"""
     return User(
@@ -37,7 +39,7 @@ def mock_user():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers():
     """Mock authorization headers"""
     return {"Authorization": "Bearer mock-token"}